@@ -18,7 +18,7 @@ from .enum import JoinMethod
 from .errors import OverwriteError, ValidationError
 from .hash import generate_hash
 from .heading import parse_definition, reform_definition
-from .utils import classproperty, format_rows_to_df, format_table_name, unwrap, wrap, load_dependencies
+from .utils import classproperty, format_rows_to_df, format_rows_to_records, format_table_name, unwrap, wrap, load_dependencies
 from .validation import (_is_overwrite_validated,
                          _validate_hash_name_type_and_parse_hash_len,
                          pairwise_disjoint_set_validation)
@@ -49,11 +49,17 @@ class Base:
     # logging
     loglevel = config['loglevel']
 
+    # set _abstract = True in a class body to skip validation for that (intermediate) class only
+    _abstract = False
+
     @classmethod
     def _init_validation(cls, **kwargs):
         """
         Validation for initialization of subclasses of abstract class Base. 
         """
+        if cls.__dict__.get('_abstract', False):
+            return
+
         for attr in ['enable_hashing', 'hash_group', 'hash_table_name', '_add_hash_name_to_header', '_add_hash_params_to_header', '_add_hashed_attrs_to_header']:
             assert isinstance(getattr(cls, attr), bool), f'"{attr}" must be boolean.'           
 
@@ -418,15 +424,18 @@ class Base:
 
         :returns: (dict) Dictionary containing fetch1 results
         """
-        try:
-            if attrs != {}:
-                attrs = wrap(attrs)
-                result = wrap((self & key).fetch1(*attrs))
-                return {a: r for a, r in zip(attrs, result)}
-            else:
-                return (self & key).fetch1()
-        except AttributeError as e:
-            raise AttributeError(e.args[0] + f'. Did you instantiate the class?') from None
+        if not isinstance(self, QueryExpression):
+            raise AttributeError('get must be called on a table instance. Did you instantiate the class?')
+
+        if isinstance(attrs, str):
+            return {attrs: (self & key).fetch1(attrs)}
+
+        if attrs != {}:
+            attrs = wrap(attrs)
+            result = wrap((self & key).fetch1(*attrs))
+            return {a: r for a, r in zip(attrs, result)}
+        else:
+            return (self & key).fetch1()
 
     @classmethod
     def _get_attr_name_from_type(cls, attr_type):
@@ -537,6 +546,9 @@ class BaseMaster(Base):
         """
         Validation for initialization of subclasses of abstract class BaseMaster. 
         """
+        if cls.__dict__.get('_abstract', False):
+            return
+
         for attr in ['hash_table_name', 'hash_part_table_names']:
             assert isinstance(getattr(cls, attr), bool), f'"{attr}" must be a boolean.'
 
@@ -703,7 +715,7 @@ class BaseMaster(Base):
         renamed_parts = []
         for p, attrs in zip(parts, attributes_to_rename):
             if isinstance(p, dj.Part):
-                name = format_table_name(p.table_name, snake_case=True, part=True).split('.')[1]
+                name = format_table_name(p.table_name, snake_case=True, part=True).rsplit('.', 1)[-1]
             else:
                 name = format_table_name(p.table_name, snake_case=True)
 
@@ -741,7 +753,12 @@ class BaseMaster(Base):
             parts = [p for p in parts if p.full_table_name not in [e.full_table_name for e in cls._format_parts(exclude_parts)]]
         
         if filter_out_disjoint:
-            parts = [p & part_restr for p in parts if not set(p.heading.names).isdisjoint(format_rows_to_df(part_restr).columns)]
+            if isinstance(part_restr, QueryExpression):
+                restr_attrs = set(part_restr.heading.names)
+            else:
+                restr_records = format_rows_to_records(part_restr)
+                restr_attrs = set(restr_records.dtype.names) if isinstance(restr_records, np.ndarray) else {k for row in restr_records for k in row}
+            parts = [p & part_restr for p in parts if not set(p.heading.names).isdisjoint(restr_attrs)]
         else:
             parts = [p & part_restr for p in parts]
 
@@ -927,6 +944,9 @@ class BasePart(Base):
         """
         Validation for initialization of subclasses of abstract class BasePart. 
         """
+        if cls.__dict__.get('_abstract', False):
+            return
+
         super()._init_validation(hash_table_name=cls.hash_table_name)
     
     @classmethod
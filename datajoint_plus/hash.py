@@ -1,4 +1,5 @@
 import collections
+import functools
 import hashlib
 import inspect
 
@@ -62,6 +63,7 @@ def validate_and_generate_hash(rows, **kwargs):
     return generate_hash(rows, **kwargs)
 
 
+@functools.lru_cache(maxsize=4096)
 def generate_table_id(full_table_name):
     """
     Generates table_id by hashing full_table_name.
@@ -5,6 +5,7 @@ from collections import namedtuple
 import inspect
 from .logging import getLogger
 import re
+import sys
 import datajoint as dj
 import numpy as np
 from datajoint_plus.definition import StrToTable
@@ -13,7 +14,7 @@ from datajoint.fetch import is_key
 from datajoint.expression import Projection
 from datajoint_plus.user_tables import UserTable
 
-from .base import BaseMaster, BasePart
+from .base import Base, BaseMaster, BasePart
 from .utils import classproperty, safedict, unwrap, wrap
 
 logger = getLogger(__name__)
@@ -54,6 +55,17 @@ class Destination(StrToTable):
         else:
             super().__init__(source=source, inheritance=inheritance, put=put, context=context, **kwargs)
 
+# fixed namedtuple types for NestedMaker.upstream and NestedMaker.downstream
+_Upstream = namedtuple('upstream', ['entities', 'methods'])
+_Downstream = namedtuple('downstream', ['destinations'])
+
+# maps emd type to the name of its function and the error raised if the function is missing
+_emd_fxn_types = {
+    Entity: ('get', MakerInputError),
+    Method: ('run', MakerMethodError),
+    Destination: ('put', MakerDestinationError),
+}
+
 
 class Motif:
     """
@@ -62,6 +74,8 @@ class Motif:
 
     @classmethod
     def _init_validation(cls, **kwargs):
+        if cls.__dict__.get('_abstract', False):
+            return
         if (cls.hash_name is None) and (cls.lookup_name is None):
             raise NotImplementedError('Subclasses of Motif must implement "lookup_name" or "hash_name".')
     
@@ -99,9 +113,13 @@ class Motif:
                     )
                 )
         if emds is not None:
+            field_names = []
+            for t in emds:
+                table = t.table # instantiate once; class_name is a classproperty
+                field_names.append(sys.intern(getattr(table, 'class_name_valid_id', None) or table.class_name))
             nt = namedtuple(
-                emd_type, 
-                field_names=[getattr(t.table, 'class_name_valid_id', getattr(t.table, 'class_name')) for t in emds]
+                emd_type,
+                field_names=field_names
             )
             nt.__repr__ = cls.nt_repr
             return nt(*emds)
@@ -217,12 +235,17 @@ class NestedMaker(Motif, BasePart, UserTable, dj.Part, dj.Computed):
     _dict_merge_allow_overwrite = False
     _append_timestamp_to_definition = True
     _timestamp_name = 'ts_inserted'
+    prefetch_entities = False
+    _make_cache = None
     
     def _init_validation(cls, **kwargs):
         super(Motif, cls)._init_validation(**kwargs)
         super()._init_validation(**kwargs)
 
     def __init_subclass__(cls, **kwargs):
+        if cls.__dict__.get('_abstract', False):
+            return
+
         # HASHED ATTRS
         if getattr(cls, 'hashed_attrs', None) == 'key_source':
             cls.hashed_attrs = cls.key_source.primary_key
@@ -231,13 +254,14 @@ class NestedMaker(Motif, BasePart, UserTable, dj.Part, dj.Computed):
         # make definition
         if cls.definition is None:
             # sort dependencies
+            # evaluate each emd namedtuple once instead of once per inheritance type
+            emd_nts = {emd_type: getattr(cls, emd_type) for emd_type in ['entities', 'methods', 'destinations']}
             foreign_key = {'primary': [], 'secondary': []}
             for ps in ['primary', 'secondary']:
-                for emd_type in ['entities', 'methods', 'destinations']:
-                    emd_nt = getattr(cls, emd_type)
+                for emd_type, emd_nt in emd_nts.items():
                     for emd in emd_nt:
                         if emd.inheritance == ps:
-                            foreign_key[ps].extend(f"-> self.str_to_base(**{{'emd_type': '{emd_type}', 'source': '{emd.source}', 'context': self.declaration_context}}) \n") 
+                            foreign_key[ps].append(f"-> self.str_to_base(**{{'emd_type': '{emd_type}', 'source': '{emd.source}', 'context': self.declaration_context}}) \n") 
             
             definition = ''.join([
                 "-> master \n",
@@ -276,18 +300,18 @@ class NestedMaker(Motif, BasePart, UserTable, dj.Part, dj.Computed):
     
     @classproperty
     def upstream(cls):
-        return namedtuple('upstream', ['entities', 'methods'])(cls.entities, cls.methods)
+        return _Upstream._make((cls.entities, cls.methods))
     
     @classproperty
     def downstream(cls):
-        return namedtuple('downstream', ['destinations'])(cls.destinations)
+        return _Downstream._make((cls.destinations,))
     
     @classproperty
     def key_source(cls):
         ks = []
-        for emd_type in ['get_entities', 'run_methods']:
-            if getattr(cls, emd_type) is not None:
-                items = getattr(cls, emd_type.split('_')[1])
+        for source_attr, emd_type in [('get_entities', 'entities'), ('run_methods', 'methods')]:
+            if getattr(cls, source_attr) is not None:
+                items = getattr(cls, emd_type)
                 for i in items:
                     if i.add_to_key_source:
                         ks.append(i.table)
@@ -299,17 +323,17 @@ class NestedMaker(Motif, BasePart, UserTable, dj.Part, dj.Computed):
         """
         Extracts the "get", "run" or "put" function from the input.
         """
-        if getattr(emd, 'is_entity', False):
-            fxn_type = 'get'
-            err = MakerInputError
-        elif getattr(emd, 'is_method', False):
-            fxn_type = 'run'
-            err = MakerMethodError
-        elif getattr(emd, 'is_destination', False):
-            fxn_type = 'put'
-            err = MakerDestinationError
-        else:
-            raise AttributeError(f'type {type(emd)} not recognized. Expected djp.Entity, djp.Method or djp.Destination.')
+        try:
+            fxn_type, err = _emd_fxn_types[type(emd)]
+        except KeyError:
+            if getattr(emd, 'is_entity', False):
+                fxn_type, err = _emd_fxn_types[Entity]
+            elif getattr(emd, 'is_method', False):
+                fxn_type, err = _emd_fxn_types[Method]
+            elif getattr(emd, 'is_destination', False):
+                fxn_type, err = _emd_fxn_types[Destination]
+            else:
+                raise AttributeError(f'type {type(emd)} not recognized. Expected djp.Entity, djp.Method or djp.Destination.')
         
         fxn = getattr(emd, fxn_type, None) or getattr(emd.table, fxn_type, None)
 
@@ -330,14 +354,62 @@ class NestedMaker(Motif, BasePart, UserTable, dj.Part, dj.Computed):
             raise MakerError(msg)
         return arg
     
+    def populate(self, *restrictions, **kwargs):
+        """
+        Extends DataJoint populate. If prefetch_entities is True, entities that use the default "get" are fetched 
+        for all keys to populate with one query per entity, instead of one query per entity per key in make.
+        """
+        if self.prefetch_entities:
+            self._make_cache = self._prefetch_entities(*restrictions, limit=kwargs.get('limit'))
+        try:
+            return super().populate(*restrictions, **kwargs)
+        finally:
+            self._make_cache = None
+
+    def _prefetch_entities(self, *restrictions, limit=None):
+        """
+        Fetches rows of entities that use the default "get" for the keys populate will make: 
+        keys in key_source after restriction that are not yet populated.
+
+        :param limit: (int) populate limit; if provided, only the first limit keys are prefetched
+        :returns: (dict) mapping of entity source to (primary_key, {primary key values: row})
+        """
+        cache = {}
+        if self.entities:
+            todo = (self.key_source & dj.AndList(restrictions)) - self
+            keys = todo.proj() if limit is None else todo.fetch('KEY', limit=limit)
+            for e in self.entities:
+                if getattr(e, 'get', None) is not None:
+                    continue
+                table = e.table
+                if getattr(type(table), 'get', None) is not Base.get:
+                    continue
+                pk = table.primary_key
+                cache[e.source] = (pk, {tuple(row[k] for k in pk): row for row in (table & keys).fetch(as_dict=True)})
+        return cache
+
+    def _get_prefetched(self, emd, key):
+        """
+        Returns the prefetched row of emd for key, or None if not prefetched.
+        """
+        if self._make_cache is None or emd.source not in self._make_cache:
+            return None
+        pk, rows = self._make_cache[emd.source]
+        try:
+            return rows[tuple(key[k] for k in pk)]
+        except KeyError:
+            return None
+
     def make(self, key):
         # GET ENTITIES
         inputs = safedict(warn=self._dict_merge_warn_overwrite, overwrite=self._dict_merge_allow_overwrite)
         if self.entities:
             for e in self.entities:
-                get = self._extract_fxn(e)
-                inp = self._validate_arg(get(key))
-                inputs.update(**inp)
+                inp = self._get_prefetched(e, key)
+                if inp is None:
+                    get = self._extract_fxn(e)
+                    inp = get(key)
+                inputs.update(**self._validate_arg(inp))
         inputs = {**key, **inputs}
 
         # RUN METHODS
@@ -4,12 +4,14 @@ DataJointPlus Schema extensions
 
 from .logging import getLogger
 import types
+import pymysql
+from contextlib import contextmanager
 
 import datajoint as dj
+from datajoint.errors import DataJointError
 from .compatibility import add_datajoint_plus
 from .utils import enable_datajoint_flags, load_dependencies, register_externals, split_full_table_name, reform_full_table_name
-from .table import TableLog
-from .hash import generate_table_id
+from .table import get_table_log
 from .utils import classproperty
 from .table import FreeTable
 from .jobs import JobTable
@@ -21,36 +23,87 @@ class Schema(dj.Schema):
     Extension of dj.Schema that adds a table log
 
     Additional params:
-    :param load_dependencies (bool): Loads the DataJoint graph.
+    :param load_dependencies (bool): Loads the DataJoint graph. If False (default), DataJoint loads 
+        the graph the first time it is used (e.g. by parts, descendants, delete or insert).
     """
     def __init__(self, schema_name, context=None, load_dependencies=False, update_table_log=False, *, connection=None, create_schema=True, create_tables=True):
         super().__init__(schema_name=schema_name, context=context, connection=connection, create_schema=create_schema, create_tables=create_tables)
 
-        if update_table_log:
-            try:
-                self._tables = None
-                for table_name in self.list_tables():
-                    full_table_name = reform_full_table_name(self.database, table_name)
-                    self.tables(generate_table_id(full_table_name), full_table_name, action='add')
-                for key in self._tables:
-                    _, name = split_full_table_name(key['full_table_name'])
-                    if name not in self.list_tables():
-                        self.tables(full_table_name=key['full_table_name'], action='delete')
-            except:
-                logger.warning('Could not update schema.tables')
+        self._tables = None
+        if update_table_log and self.database is not None:
+            self.update_table_log()
         
         if load_dependencies:
             self.load_dependencies()
 
+    def update_table_log(self):
+        """
+        Adds tables in the schema to the table log and marks logged tables no longer in the schema as deleted.
+        """
+        try:
+            existing = set(self.list_tables())
+            tables = self.tables
+            tables.flush()
+
+            # table_name -> table_id of tables currently logged as existing
+            logged = {
+                split_full_table_name(full_table_name)[1]: table_id 
+                for table_id, full_table_name in zip(*(tables & {'exists': 1}).fetch('table_id', 'full_table_name'))
+            }
+
+            tables.add_many([reform_full_table_name(self.database, table_name) for table_name in existing - logged.keys()])
+            tables.mark_deleted_many([logged[table_name] for table_name in logged.keys() - existing])
+        except (DataJointError, pymysql.err.Error):
+            logger.warning('Could not update schema.tables')
+
+    @contextmanager
+    def batch_meta(self):
+        """
+        Context manager for declaring many tables or schemas at once. Inside the block, table log 
+        writes are buffered and clearing the DataJoint dependency graph is deferred. When the outermost 
+        block exits, buffered log events of the connection are written and the graph is cleared at most once.
+
+        Example:
+            with schema.batch_meta():
+                schema_a = djp.schema('a')
+                schema_b = djp.schema('b')
+        """
+        connection = self.connection
+        connection._djp_batch_meta_depth = connection.__dict__.get('_djp_batch_meta_depth', 0) + 1
+        try:
+            yield self
+        finally:
+            connection._djp_batch_meta_depth -= 1
+            if not connection._djp_batch_meta_depth:
+                for log in list(connection.__dict__.get('_djp_table_logs', {}).values()):
+                    try:
+                        log.flush()
+                    except Exception as e:
+                        logger.exception(e)
+                        logger.info('failure flushing ~tables')
+                if connection.__dict__.pop('_djp_pending_dep_clear', False):
+                    connection.dependencies.clear()
 
     @classproperty
     def is_schema(cls):
         True
 
+    def drop(self, force=False):
+        """
+        Drops the schema. The schema's table log is dropped with it, so the cached log is discarded 
+        instead of marking each table as deleted.
+        """
+        super().drop(force=force)
+        if not self.exists:
+            log = self.connection.__dict__.get('_djp_table_logs', {}).get(self.database)
+            if log is not None:
+                log._discard()
+            self._tables = None
+
     @property
     def tables(self):
         if self._tables is None:
-            self._tables = TableLog(self.connection, self.database)
+            self._tables = get_table_log(self.connection, self.database)
         return self._tables
 
     def free_table(self, table_name=None, full_table_name=None):
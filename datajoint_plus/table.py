@@ -1,12 +1,17 @@
 """
 Extensions of DataJoint Table
 """
+import atexit
 import inspect
+import math
 import numpy as np
+import queue
+import threading
+import time
 import uuid
 import collections
 import pandas
-import itertools
+import pymysql
 from pathlib import Path
 
 from .logging import getLogger
@@ -21,18 +26,79 @@ from datajoint.expression import QueryExpression
 from datajoint_plus import blob
 from datajoint_plus.hash import generate_table_id
 
-from .utils import classproperty, goto
+from .utils import classproperty, goto, split_full_table_name
 from .version import __version__ as version
 
 logger = getLogger(__name__)
 
+# TableLog instances with buffered events, keyed by id, flushed at interpreter exit
+_logs_with_pending_events = {}
+
+# table_id -> full_table_name of tables added to a TableLog in this process
+_table_id_to_full_table_name = {}
+
+# MySQL deadlock and lock wait timeout; ~tables writes are retried with backoff on these
+_LOCK_ERRORS = (1213, 1205)
+_LOCK_RETRIES = 3
+
+# events queued for the background ~tables writer, see TableLog.background
+_log_queue = queue.Queue(maxsize=10000)
+_log_thread = None
+_log_thread_lock = threading.Lock()
+# queued by TableLog.flush to make the writer thread write all of its batches
+_log_flush_request = object()
+
+# parameterized ~tables queries; {table} is filled once per TableLog, {{...}} per call with %s placeholders
+_SQL_UPSERT = "INSERT INTO {table} (`table_id`, `full_table_name`, `exists`, `djp_version`) VALUES {{values}} ON DUPLICATE KEY UPDATE `exists`=1"
+_SQL_SET_EXISTS = "UPDATE {table} SET `exists`=%s WHERE `table_id` IN ({{table_ids}})"
+_SQL_LOOKUP_BY_TID = "SELECT `table_id`, `full_table_name` FROM {table} WHERE `table_id`=%s"
+_SQL_LOOKUP_BY_NAME = "SELECT `table_id`, `full_table_name` FROM {table} WHERE `full_table_name`=%s"
+_SQL_MATCH_TID = "SELECT `table_id`, `full_table_name` FROM {table} WHERE `table_id` LIKE %s LIMIT 2"
+
+
+def _convert_numeric(value):
+    """
+    Returns the placeholder and processed value of a value of a numeric attribute in Table.insert: 
+    None, '' and NaN become DEFAULT, bools are inserted as integers and other values as str(value).
+    """
+    if value is None or value == '' or math.isnan(float(value)):
+        return 'DEFAULT', None
+    return '%s', str(int(value) if isinstance(value, bool) else value)
+
+
+def _is_numeric_fast_path_dtype(dtype):
+    """
+    Returns True for dtypes whose values tolist() converts to Python scalars with the same str as the numpy scalar:
+    bool, signed and unsigned integers and float64. Smaller floats (e.g. float32) print differently once widened to 
+    Python floats, so they take the per-cell path.
+    """
+    return dtype.kind in 'biu' or (dtype.kind == 'f' and dtype.itemsize == 8)
+
+
+def _numeric_columns_to_rows(rows, names):
+    """
+    Converts the fields names of a structured array column by column to rows to insert. 
+    Values match _convert_numeric, the per-cell path of Table.insert: NaN becomes DEFAULT, other values str(value).
+
+    :param rows: numpy structured array with fields of _is_numeric_fast_path_dtype
+    :param names: (list) field names, in heading order
+    :return: list of dicts with fields 'names', 'placeholders', 'values'
+    """
+    columns = []
+    for name in names:
+        column = rows[name]
+        isnan = np.isnan(column) if column.dtype.kind == 'f' else np.zeros(len(column), dtype=bool)
+        columns.append([None if nan else str(v) for v, nan in zip(column.tolist(), isnan.tolist())])
+    return [
+        {'names': names, 'placeholders': ['DEFAULT' if v is None else '%s' for v in values], 'values': values} 
+        for values in zip(*columns)
+    ]
+
 
 class Table(dj.table.Table):
     """
     Extensions to DataJoint Table
     """
-    
-    _table_log_ = None
 
     def declare(self, context=None):
         super().declare(context=context)
@@ -61,11 +127,15 @@ class Table(dj.table.Table):
         if isinstance(self, str):
             raise AttributeError('Instantiate table to run goto().')
         
-        if len(self)==1:
+        # fall back to the table_id of a single-row table only if nothing else identifies the target
+        if table_id is None and full_table_name is None and tid_attr is None and ftn_attr is None and 'table_id' in self.heading.names:
+            # one query instead of len(self) followed by fetch1
             try:
-                table_id = self.fetch1('table_id')
+                table_ids = self.fetch('table_id', limit=2)
             except DataJointError:
-                pass
+                table_ids = []
+            if len(table_ids) == 1:
+                table_id = table_ids[0]
         
         if table_id is None and tid_attr is not None:
             table_id = self.fetch1(tid_attr)
@@ -77,6 +147,8 @@ class Table(dj.table.Table):
             raise Exception('Provide either table_id/full_table_name or tid_attr/ ftn_attr.')
 
         if return_free_table:
+            if full_table_name is None:
+                full_table_name = _table_id_to_full_table_name.get(table_id)
             if full_table_name is None:
                 try:
                     if tid_attr is None:
@@ -91,13 +163,17 @@ class Table(dj.table.Table):
 
     @property
     def _table_log(self):
-        if self._table_log_ is None:
-            self._table_log_ = TableLog(self.connection, database=self.database)
-        return self._table_log_
+        return get_table_log(self.connection, self.database)
 
     @classproperty
     def table_id(cls):
-        return generate_table_id(cls.full_table_name)
+        # cached per class; keyed on database in case the class is bound to another schema
+        cached = cls.__dict__.get('_table_id_cache')
+        if cached is not None and cached[0] == cls.database:
+            return cached[1]
+        table_id = generate_table_id(cls.full_table_name)
+        cls._table_id_cache = (cls.database, table_id)
+        return table_id
 
     def insert(self, rows, replace=False, skip_duplicates=False, ignore_extra_fields=False, allow_direct_insert=None):
         """
@@ -136,12 +212,10 @@ class Table(dj.table.Table):
         if isinstance(rows, QueryExpression):
             # insert from select
             if not ignore_extra_fields:
-                try:
+                extra = next((name for name in rows.heading if name not in heading), None)
+                if extra is not None:
                     raise DataJointError(
-                        "Attribute %s not found. To ignore extra attributes in insert, set ignore_extra_fields=True." %
-                        next(name for name in rows.heading if name not in heading))
-                except StopIteration:
-                    pass
+                        "Attribute %s not found. To ignore extra attributes in insert, set ignore_extra_fields=True." % extra)
             fields = list(name for name in rows.heading if name in heading)
             query = '{command} INTO {table} ({fields}) {select}{duplicate}'.format(
                 command='REPLACE' if replace else 'INSERT',
@@ -158,6 +232,57 @@ class Table(dj.table.Table):
             logger.warning('Could not access table {table}'.format(table=self.full_table_name))
             return
 
+        def make_converter(attr):
+            """
+            Returns a function that maps a value of attribute `attr` to its placeholder and processed value. 
+            The attribute type is resolved once here rather than for every inserted value.
+            :param attr: heading attribute
+            """
+            name, adapter, numeric = attr.name, attr.adapter, attr.numeric
+
+            if attr.uuid:
+                def process(value):
+                    if isinstance(value, uuid.UUID):
+                        return value.bytes
+                    if isinstance(value, bytes) and len(value) == 16:
+                        return value
+                    try:
+                        return uuid.UUID(value).bytes
+                    except (AttributeError, ValueError):
+                        raise DataJointError(
+                            'badly formed UUID value {v} for attribute `{n}`'.format(v=value, n=name)) from None
+            elif attr.is_blob:
+                def process(value):
+                    value = blob.pack(value)
+                    return self.external[attr.store].put(value).bytes if attr.is_external else value
+            elif attr.is_attachment:
+                def process(value):
+                    attachment_path = Path(value)
+                    if attr.is_external:
+                        # value is hash of contents
+                        return self.external[attr.store].upload_attachment(attachment_path).bytes
+                    # value is filename + contents
+                    return str.encode(attachment_path.name) + b'\0' + attachment_path.read_bytes()
+            elif attr.is_filepath:
+                def process(value):
+                    return self.external[attr.store].upload_filepath(value).bytes
+            else:
+                def process(value):
+                    return value
+
+            def convert(value):
+                if adapter:
+                    value = adapter.put(value)
+                if numeric:
+                    return _convert_numeric(value)
+                if value is None:
+                    # set default value
+                    return 'DEFAULT', None
+                return '%s', process(value)
+
+            return convert
+
+        converters = {name: make_converter(attr) for name, attr in heading.attributes.items()}
         field_list = None  # ensures that all rows have the same attributes in the same order as the first row.
 
         def make_row_to_insert(row):
@@ -175,37 +300,7 @@ class Table(dj.table.Table):
                 """
                 if ignore_extra_fields and name not in heading:
                     return None
-                attr = heading[name]
-                if attr.adapter:
-                    value = attr.adapter.put(value)
-                if value is None or (attr.numeric and (value == '' or np.isnan(float(value)))):
-                    # set default value
-                    placeholder, value = 'DEFAULT', None
-                else:  # not NULL
-                    placeholder = '%s'
-                    if attr.uuid:
-                        if not isinstance(value, uuid.UUID):
-                            try:
-                                value = uuid.UUID(value)
-                            except (AttributeError, ValueError):
-                                raise DataJointError(
-                                    'badly formed UUID value {v} for attribute `{n}`'.format(v=value, n=name)) from None
-                        value = value.bytes
-                    elif attr.is_blob:
-                        value = blob.pack(value)
-                        value = self.external[attr.store].put(value).bytes if attr.is_external else value
-                    elif attr.is_attachment:
-                        attachment_path = Path(value)
-                        if attr.is_external:
-                            # value is hash of contents
-                            value = self.external[attr.store].upload_attachment(attachment_path).bytes
-                        else:
-                            # value is filename + contents
-                            value = str.encode(attachment_path.name) + b'\0' + attachment_path.read_bytes()
-                    elif attr.is_filepath:
-                        value = self.external[attr.store].upload_filepath(value).bytes
-                    elif attr.numeric:
-                        value = str(int(value) if isinstance(value, bool) else value)
+                placeholder, value = converters[name](value)
                 return name, placeholder, value
 
             def check_fields(fields):
@@ -257,18 +352,31 @@ class Table(dj.table.Table):
 
             return row_to_insert
 
-        rows = list(make_row_to_insert(row) for row in rows)
+        if isinstance(rows, np.ndarray) and rows.dtype.names and all(
+                name in heading and heading[name].numeric and not heading[name].adapter and _is_numeric_fast_path_dtype(rows.dtype[name]) 
+                for name in rows.dtype.names):
+            field_list = [name for name in heading if name in rows.dtype.fields]
+            rows = _numeric_columns_to_rows(rows, field_list)
+        else:
+            rows = list(make_row_to_insert(row) for row in rows)
         if rows:
+            # rows share a few placeholder layouts (they differ only where DEFAULT is used), so each row template is built once
+            row_templates, placeholders = {}, []
+            for row in rows:
+                layout = tuple(row['placeholders'])
+                template = row_templates.get(layout)
+                if template is None:
+                    template = row_templates[layout] = '(' + ','.join(layout) + ')'
+                placeholders.append(template)
             try:
                 query = "{command} INTO {destination}(`{fields}`) VALUES {placeholders}{duplicate}".format(
                     command='REPLACE' if replace else 'INSERT',
                     destination=self.from_clause,
                     fields='`,`'.join(field_list),
-                    placeholders=','.join('(' + ','.join(row['placeholders']) + ')' for row in rows),
+                    placeholders=','.join(placeholders),
                     duplicate=(' ON DUPLICATE KEY UPDATE `{pk}`=`{pk}`'.format(pk=self.primary_key[0])
                                if skip_duplicates else ''))
-                self.connection.query(query, args=list(
-                    itertools.chain.from_iterable((v for v in r['values'] if v is not None) for r in rows)))
+                self.connection.query(query, args=[v for r in rows for v in r['values'] if v is not None])
             except UnknownAttributeError as err:
                 raise err.suggest('To ignore extra fields in insert, set ignore_extra_fields=True') from None
             except DuplicateError as err:
@@ -337,7 +445,29 @@ class TableLog(Table):
     Log of tables in each schema.
     Instances are callable.  Calls with table hash return the table entry. 
     Calls with hash and action update the table.
+
+    Add and delete events are written immediately. Inside schema.batch_meta() they are buffered 
+    instead and written in batches: when the buffer holds batch_size events, before the log is read 
+    through exists, deleted or a lookup, when the outermost batch_meta block exits, and at interpreter 
+    exit. Events of a write that fails (after retrying deadlocks and lock wait timeouts) are logged and 
+    discarded, so a bad event fails only the write it is part of.
+
+    If background is True, events are instead queued and written by a daemon thread with its own 
+    connection. When the queue is full, events are written synchronously. flush_interval only applies 
+    to background writes.
     """
+    batch_size = 100
+    flush_interval = 5 # seconds
+    background = False
+    _definition_template = """    # tables in `{database}`
+        table_id        :varchar(32)  # unique hash of full_table_name
+        ---
+        full_table_name : varchar(450) # name of table
+        exists          : tinyint  # 1 - table exists in schema; 0 - table no longer exists
+        djp_version     : varchar(32)  # version of datajoint_plus used to generate table_id
+        timestamp = CURRENT_TIMESTAMP : timestamp # timestamp of entry (not necessarily when table was created)
+        index(exists, table_id)
+        """
 
     def __init__(self, arg, database=None):
         super().__init__()
@@ -348,23 +478,30 @@ class TableLog(Table):
             self._connection = arg._connection
             self._definition = arg._definition
             self._user = arg._user
+            self._pending = arg._pending
+            self._full_table_name = arg._full_table_name
+            self._is_declared = arg._is_declared
+            self._sql = arg._sql
             return
 
         self.database = database
         self._connection = arg
-        self._definition = f"""    # tables in `{database}`
-        table_id        :varchar(32)  # unique hash of full_table_name
-        ---
-        full_table_name : varchar(450) # name of table
-        exists          : tinyint  # 1 - table exists in schema; 0 - table no longer exists
-        djp_version     : varchar(32)  # version of datajoint_plus used to generate table_id
-        timestamp = CURRENT_TIMESTAMP : timestamp # timestamp of entry (not necessarily when table was created)
-        """
+        self._pending = collections.deque()
+        self._full_table_name = f'`{database}`.`{self.table_name}`'
+        self._is_declared = False
+        self._definition = self._definition_template.format(database=database)
+        self._sql = {
+            'upsert': _SQL_UPSERT.format(table=self._full_table_name),
+            'set_exists': _SQL_SET_EXISTS.format(table=self._full_table_name),
+            'lookup_by_tid': _SQL_LOOKUP_BY_TID.format(table=self._full_table_name),
+            'lookup_by_name': _SQL_LOOKUP_BY_NAME.format(table=self._full_table_name),
+            'match_tid': _SQL_MATCH_TID.format(table=self._full_table_name),
+        }
 
         if not self.is_declared:
             self.declare()
-            self.connection.dependencies.clear()
-        self._user = self.connection.get_user()
+            clear_dependencies(self.connection)
+        self._user = _get_user(self.connection)
 
     @property
     def definition(self):
@@ -373,6 +510,17 @@ class TableLog(Table):
     @property
     def table_name(self):
         return '~tables'
+
+    @property
+    def full_table_name(self):
+        return self._full_table_name
+
+    @property
+    def is_declared(self):
+        # cached once the log is known to exist; reset by drop_quick
+        if not self._is_declared:
+            self._is_declared = dj.table.Table.is_declared.fget(self)
+        return self._is_declared
     
     @property
     def table_id(self):
@@ -387,60 +535,226 @@ class TableLog(Table):
             delete - deletes table from log
         """
         try:
-            if action == 'add':
-                assert full_table_name is not None, 'full_table_name needed to add table'
-                
-                if table_id is None:
-                    table_id = generate_table_id(full_table_name)
-                else:
-                    assert table_id == generate_table_id(full_table_name), 'Provided table_id does not match generated table_id.'
-
-                restr = self & {'table_id': table_id}
-
-                if len(restr) == 0:
-                    self.insert1(
-                        dict(
-                            table_id=table_id, 
-                            full_table_name=full_table_name, 
-                            exists=1,
-                            djp_version=version
-                            ),
-                        )
-                restr._update('exists', 1)
-      
+            return self._actions.get(action, TableLog._lookup)(self, table_id, full_table_name, directory)
+
+        except (AssertionError, DataJointError, pymysql.err.Error) as e:
+            logger.exception(e)
+            logger.info('failure interacting with ~tables')
+
+    def _log_add(self, table_id, full_table_name, directory):
+        assert full_table_name is not None, 'full_table_name needed to add table'
+        
+        if table_id is None:
+            table_id = generate_table_id(full_table_name)
+        else:
+            assert table_id == generate_table_id(full_table_name), 'Provided table_id does not match generated table_id.'
+
+        self._add_event(table_id, full_table_name, 'add')
+
+    def _log_delete(self, table_id, full_table_name, directory):
+        assert not ((table_id is None) and (full_table_name is None)), 'Provide table_id or full_table_name to delete.'
+        if full_table_name is not None:
+            table_id_eval = generate_table_id(full_table_name)
+            assert table_id is None or table_id_eval.startswith(table_id), 'Provided table_id does not match generated table_id.'
+            table_id = table_id_eval
+        elif len(table_id) < 32:
+            self._flush_before_read()
+            table_id, _ = self._resolve_table_id(table_id)
+
+        self._add_event(table_id, full_table_name, 'delete')
+
+    def _lookup(self, table_id, full_table_name, directory):
+        if (table_id is None) and (full_table_name is None):
+            return self
+
+        # tables logged on any connection are cached; only those of this log's database skip the query
+        cached = _table_id_to_full_table_name.get(table_id) if full_table_name is None else None
+        if cached is not None and split_full_table_name(cached)[0] == self.database:
+            return goto(table_id, directory=directory)
+
+        self._flush_before_read()
+
+        # a full table_id is a primary key lookup; a partial table_id is resolved with a bound LIKE query
+        if full_table_name is None and len(table_id) < 32:
+            table_id, full_table_name = self._resolve_table_id(table_id)
+        else:
+            if full_table_name is not None:
+                rows = self.connection.query(self._sql['lookup_by_name'], args=(full_table_name,)).fetchall()
+                rows = [r for r in rows if table_id is None or r[0].startswith(table_id)]
             else:
-                table_id_restr = f'table_id LIKE "{table_id}%"' if table_id is not None else None
-                full_table_name_restr = {'full_table_name': full_table_name} if full_table_name is not None else None
-                
-                restr = [r for r in [table_id_restr, full_table_name_restr] if r is not None]
-                restr = self & dj.AndList(restr)
+                rows = self.connection.query(self._sql['lookup_by_tid'], args=(table_id,)).fetchall()
+            assert len(rows) == 1, f'Expected one entry in ~tables, found {len(rows)}.'
+            table_id, full_table_name = rows[0]
 
-                if action == 'delete':
-                    assert ~((table_id is None) and (full_table_name is None)), 'Provide table_id or full_table_name to delete.'
-                    assert len(restr) == 1, 'There should be only one entry to delete.'
-                    restr._update('exists', 0)
-                    return
+        _table_id_to_full_table_name[table_id] = full_table_name
+        return goto(table_id, directory=directory)
 
-                if (table_id is None) and (full_table_name is None):
-                    return self
+    # action -> handler; any other action is a lookup
+    _actions = {'add': _log_add, 'delete': _log_delete}
 
-                table_id, full_table_name = restr.fetch1('table_id', 'full_table_name')
-                table = goto(table_id, directory=directory)
-                return table
+    def _resolve_table_id(self, prefix):
+        """
+        Returns (table_id, full_table_name) of the single entry in log whose table_id starts with prefix.
+        At most two rows are read, enough to tell a unique prefix from an ambiguous one.
+        """
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        rows = self.connection.query(self._sql['match_tid'], args=(escaped + '%',)).fetchall()
+        assert len(rows) == 1, f'table_id {prefix} matched {"no" if not rows else "more than one"} entry in ~tables.'
+        return rows[0]
 
-        except Exception as e:
+    def _add_event(self, table_id, full_table_name, action):
+        """
+        Writes an add or delete event, or buffers it inside schema.batch_meta() until the buffer is full.
+        """
+        if action == 'add':
+            _table_id_to_full_table_name[table_id] = full_table_name
+        else:
+            _table_id_to_full_table_name.pop(table_id, None)
+        if self.background:
+            try:
+                _log_queue.put_nowait((self, (table_id, full_table_name, action)))
+                _start_log_writer()
+                return
+            except queue.Full:
+                pass
+        self._pending.append((table_id, full_table_name, action))
+        _logs_with_pending_events[id(self)] = self
+        if not self.connection.__dict__.get('_djp_batch_meta_depth', 0) or len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes buffered add and delete events to the log in one transaction. 
+        Every added table is logged; the exists flag reflects the last event per table.
+        If the write fails, its events are logged and discarded and the error is raised.
+        If background is True, events queued before the call are written by the writer thread first; 
+        the writer thread logs its failed writes instead of raising them here.
+        """
+        if self.background and _log_thread is not None and _log_thread.is_alive() and threading.current_thread() is not _log_thread:
+            # queued events precede buffered ones
+            _log_queue.put(_log_flush_request)
+            _log_queue.join()
+        if not self._pending:
+            _logs_with_pending_events.pop(id(self), None)
+            return
+
+        events = list(self._pending)
+        added, last_action = {}, {}
+        for table_id, full_table_name, action in events:
+            if action == 'add':
+                added[table_id] = full_table_name
+            last_action[table_id] = action
+
+        adds = [{'table_id': t, 'full_table_name': f} for t, f in added.items()]
+        deletes = [t for t, a in last_action.items() if a == 'delete']
+
+        try:
+            if self.connection.in_transaction:
+                # a deadlock rolls back the enclosing transaction, so it is not retried here
+                self.bulk_add(adds)
+                self._set_exists(deletes, 0)
+            else:
+                for attempt in range(_LOCK_RETRIES):
+                    try:
+                        with self.connection.transaction:
+                            self.bulk_add(adds)
+                            self._set_exists(deletes, 0)
+                        break
+                    except pymysql.err.OperationalError as e:
+                        if e.args[0] not in _LOCK_ERRORS or attempt == _LOCK_RETRIES - 1:
+                            raise
+                        time.sleep(0.05 * 2 ** attempt)
+        except (DataJointError, pymysql.err.Error):
+            logger.warning(f'Discarding {len(events)} ~tables events that could not be written: {events}')
+            raise
+        finally:
+            # a failed write is not retried by later calls, so one bad event cannot block the log
+            for _ in events:
+                self._pending.popleft()
+            if not self._pending:
+                _logs_with_pending_events.pop(id(self), None)
+
+    def _flush_before_read(self):
+        """
+        Writes buffered events before the log is read. A failed write is logged and the read goes ahead.
+        """
+        try:
+            self.flush()
+        except (DataJointError, pymysql.err.Error) as e:
             logger.exception(e)
-            logger.info('failure interacting with ~tables')
+            logger.info('failure flushing ~tables')
+
+    def bulk_add(self, rows):
+        """
+        Adds multiple tables to log, or marks them as existing if already logged, with a single upsert.
+
+        :param rows: (list) dicts with keys table_id and full_table_name
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        self.connection.query(
+            self._sql['upsert'].format(values=','.join(['(%s,%s,1,%s)'] * len(rows))),
+            args=[v for row in rows for v in (row['table_id'], row['full_table_name'], version)]
+        )
+
+    def add_many(self, full_table_names):
+        """
+        Adds multiple tables to log with a single upsert.
+
+        :param full_table_names: (list) full table names (database + table)
+        """
+        self.bulk_add([{'table_id': generate_table_id(f), 'full_table_name': f} for f in full_table_names])
+
+    def _set_exists(self, table_ids, value):
+        """
+        Sets the exists flag of multiple tables in log with a single update.
+
+        :param table_ids: (list) table_ids to update
+        :param value: (int) 1 - table exists; 0 - table no longer exists
+        """
+        table_ids = list(table_ids)
+        if not table_ids:
+            return
+        self.connection.query(
+            self._sql['set_exists'].format(table_ids=','.join(['%s'] * len(table_ids))),
+            args=[value, *table_ids]
+        )
+
+    def mark_deleted_many(self, table_ids):
+        """
+        Marks multiple tables in log as deleted with a single update. Buffered events are written first.
+
+        :param table_ids: (list) table_ids to mark as deleted
+        """
+        table_ids = list(table_ids)
+        if not table_ids:
+            return
+        for table_id in table_ids:
+            _table_id_to_full_table_name.pop(table_id, None)
+        self.flush()
+        self._set_exists(table_ids, 0)
 
     @property
     def exists(self):
         """Returns existing tables"""
-        return FreeTable(self.connection, self.full_table_name) & dj.AndList([{'exists': 1}])
+        self._flush_before_read()
+        return FreeTable(self.connection, self.full_table_name) & '`exists`=1'
 
     @property
     def deleted(self):
         """Returns deleted tables"""
-        return FreeTable(self.connection, self.full_table_name) & dj.AndList([{'exists': 0}])
+        self._flush_before_read()
+        return FreeTable(self.connection, self.full_table_name) & '`exists`=0'
+
+    def add_exists_index(self):
+        """
+        Adds the (exists, table_id) index to a log declared before the index was part of its definition.
+        Does nothing if the log already has an index on exists. Run once per schema as a migration, 
+        by a user with ALTER privilege: schema.tables.add_exists_index()
+        """
+        if not self.connection.query(f"SHOW INDEX FROM {self.full_table_name} WHERE `Column_name`='exists'").fetchall():
+            self.connection.query(f"ALTER TABLE {self.full_table_name} ADD INDEX (`exists`, `table_id`)")
 
     def delete(self):
         """bypass interactive prompts and cascading dependencies"""
@@ -449,3 +763,172 @@ class TableLog(Table):
     def drop(self):
         """bypass interactive prompts and cascading dependencies"""
         self.drop_quick()
+
+    def drop_quick(self):
+        """drops the log and discards buffered events without logging the drop to itself"""
+        dj.table.Table.drop_quick(self)
+        self._discard()
+
+    def _discard(self):
+        """
+        Discards buffered events and cached state of a log that no longer exists.
+        """
+        self._pending.clear()
+        _logs_with_pending_events.pop(id(self), None)
+        self._is_declared = False
+        self.connection.__dict__.get('_djp_table_logs', {}).pop(self.database, None)
+        for table_id, full_table_name in list(_table_id_to_full_table_name.items()):
+            if split_full_table_name(full_table_name)[0] == self.database:
+                _table_id_to_full_table_name.pop(table_id, None)
+
+
+def get_table_log(connection, database):
+    """
+    Returns the TableLog of database, shared by all tables using connection.
+
+    :param connection: (dj.Connection) DataJoint connection object
+    :param database: (str) name of schema
+    """
+    logs = connection.__dict__.setdefault('_djp_table_logs', {})
+    log = logs.get(database)
+    if log is None:
+        log = logs[database] = TableLog(connection, database=database)
+    return log
+
+
+def clear_dependencies(connection):
+    """
+    Clears the DataJoint dependency graph of connection. 
+    Inside schema.batch_meta() the clear is deferred and done once when the outermost block exits.
+
+    :param connection: (dj.Connection) DataJoint connection object
+    """
+    if connection.__dict__.get('_djp_batch_meta_depth', 0):
+        connection._djp_pending_dep_clear = True
+    else:
+        connection.dependencies.clear()
+
+
+def _get_user(connection):
+    """
+    Returns connection.get_user(), cached on the connection.
+    """
+    user = connection.__dict__.get('_djp_user')
+    if user is None:
+        user = connection._djp_user = connection.get_user()
+    return user
+
+
+def _start_log_writer():
+    """
+    Starts the background ~tables writer thread if it is not running.
+    """
+    global _log_thread
+    if _log_thread is not None and _log_thread.is_alive():
+        return
+    with _log_thread_lock:
+        if _log_thread is None or not _log_thread.is_alive():
+            _log_thread = threading.Thread(target=_log_writer, name='djp-table-log-writer', daemon=True)
+            _log_thread.start()
+
+
+def _log_writer():
+    """
+    Writes queued TableLog events until it receives None. 
+    Events are grouped per connection and database and written through a TableLog bound to a connection 
+    owned by this thread. A group is written when it holds batch_size events or flush_interval seconds 
+    after its oldest unwritten event, using the values of the TableLog that queued the events, and 
+    whenever a flush is requested.
+    """
+    connections, batches = {}, {}
+    while True:
+        due = [batch['due'] for batch in batches.values() if batch['writer_log']._pending]
+        try:
+            item = _log_queue.get(timeout=max(0., min(due) - time.monotonic()) if due else None)
+        except queue.Empty:
+            _write_log_batches(batches)
+            continue
+
+        if item is None or item is _log_flush_request:
+            _write_log_batches(batches, force=True)
+            _log_queue.task_done()
+            if item is None:
+                return
+            continue
+
+        log, event = item
+        key = (id(log.connection), log.database)
+        batch = batches.get(key)
+        if batch is None:
+            try:
+                connection = connections.get(id(log.connection))
+                if connection is None:
+                    conn_info = log.connection.conn_info
+                    connection = connections[id(log.connection)] = dj.Connection(
+                        host=conn_info['host'], 
+                        user=conn_info['user'], 
+                        password=conn_info['passwd'],
+                        port=conn_info['port'],
+                        init_fun=log.connection.init_fun,
+                        use_tls=conn_info.get('ssl_input')
+                    )
+                writer_log = TableLog(connection, database=log.database)
+                writer_log.background = False
+            except Exception as e:
+                logger.exception(e)
+                logger.info('failure connecting ~tables writer')
+                _log_queue.task_done()
+                continue
+            batch = batches[key] = {'writer_log': writer_log, 'unwritten': 0, 'due': None}
+
+        if not batch['writer_log']._pending:
+            batch['due'] = time.monotonic() + log.flush_interval
+        batch['writer_log']._pending.append(event)
+        batch['unwritten'] += 1
+        if len(batch['writer_log']._pending) >= log.batch_size:
+            _write_log_batch(batch)
+        _write_log_batches(batches)
+
+
+def _write_log_batches(batches, force=False):
+    """
+    Writes the writer thread's batches that are due, or all batches with buffered events if force is True.
+    """
+    now = time.monotonic()
+    for batch in batches.values():
+        if batch['writer_log']._pending and (force or batch['due'] <= now):
+            _write_log_batch(batch)
+
+
+def _write_log_batch(batch):
+    """
+    Writes one batch of the writer thread and acknowledges its queue items. 
+    Events of a failed write are logged and discarded by TableLog.flush, so nothing is acknowledged unwritten 
+    without a warning.
+    """
+    try:
+        batch['writer_log'].flush()
+    except Exception as e:
+        logger.exception(e)
+        logger.info('failure writing ~tables')
+    for _ in range(batch['unwritten']):
+        _log_queue.task_done()
+    batch['unwritten'] = 0
+
+
+def _flush_pending_logs():
+    """
+    Flushes buffered TableLog events at interpreter exit.
+    """
+    if _log_thread is not None and _log_thread.is_alive():
+        _log_queue.put(None)
+        _log_thread.join()
+    for log in list(_logs_with_pending_events.values()):
+        try:
+            log.flush()
+        except Exception as e:
+            logger.exception(e)
+            logger.info('failure flushing ~tables')
+
+
+atexit.register(_flush_pending_logs)
@@ -2,6 +2,7 @@
 Hosts the original DataJoint table tiers extended with DataJointPlus.
 """
 from .logging import getLogger
+import functools
 import re
 
 import datajoint as dj
@@ -12,6 +13,9 @@ from .base import BaseMaster, BasePart
 master_classes = (dj.Manual, dj.Lookup, dj.Computed, dj.Imported,)
 part_classes = (dj.Part,)
 
+_master_patterns = tuple(re.compile(tier.tier_regexp) for tier in master_classes)
+_part_patterns = tuple(re.compile(tier.tier_regexp) for tier in part_classes)
+
 logger = getLogger(__name__)
 
 class UserTable(Table, dj.user_tables.UserTable):
@@ -21,21 +25,19 @@ class UserTable(Table, dj.user_tables.UserTable):
 
     @classmethod
     def is_master(cls):
-        try:
-            next(tier for tier in master_classes
-                    if re.fullmatch(tier.tier_regexp, cls.table_name))
-            return True
-        except StopIteration:
-            return False
+        return _matches_tier(_master_patterns, cls.table_name)
 
     @classmethod
     def is_part(cls):
-        try:
-            next(tier for tier in part_classes
-                        if re.fullmatch(tier.tier_regexp, cls.table_name))
-            return True
-        except StopIteration:
-            return False
+        return _matches_tier(_part_patterns, cls.table_name)
+
+
+@functools.lru_cache(maxsize=4096)
+def _matches_tier(patterns, table_name):
+    """
+    Returns True if table_name fully matches any of the compiled tier patterns.
+    """
+    return any(pattern.fullmatch(table_name) for pattern in patterns)
 
 
 class Lookup(BaseMaster, UserTable, dj.Lookup):
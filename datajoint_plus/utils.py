@@ -1,9 +1,12 @@
 """General-purpose utilities"""
 
+import functools
 import inspect
 import logging
 import re
 import sys
+import time
+import weakref
 from unittest import mock
 import os
 
@@ -24,6 +27,17 @@ from .version import __version__
 
 logger = getLogger(__name__)
 
+_version_re = re.compile('__version__.*')
+
+# source -> (time fetched, latest version); reused by check_if_latest_version for _latest_version_ttl seconds
+_latest_version_cache = {}
+_latest_version_ttl = 3600
+
+# (id(directory), table_id) -> class matched by goto; checked against the directory before reuse
+# weak values so cached classes can be garbage collected; cleared when it reaches _goto_cache_maxsize
+_goto_cache = weakref.WeakValueDictionary()
+_goto_cache_maxsize = 1024
+
 class classproperty:
     def __init__(self, f):
         self.f = f
@@ -33,18 +47,21 @@ class classproperty:
 
 
 def wrap(item):
-    if not isinstance(item, list) and not isinstance(item, tuple):
+    if not isinstance(item, (list, tuple)):
         item = [item]
     return item
 
 
 def unwrap(item):
-    if isinstance(item, list) or isinstance(item, tuple):
-        if len(item) == 1:
-            return item[0]
+    if isinstance(item, (list, tuple)) and len(item) == 1:
+        return item[0]
     return item
 
 
+_full_table_name_re = re.compile(r'`([^`]+)`\.`([^`]+)`')
+
+
+@functools.lru_cache(maxsize=8192)
 def split_full_table_name(full_table_name:str):
     """
     Splits full_table_name from DataJoint tables and returns a tuple of (database, table_name).
@@ -53,6 +70,10 @@ def split_full_table_name(full_table_name:str):
     
     :returns (tuple): (database, table_name)
     """
+    match = _full_table_name_re.fullmatch(full_table_name)
+    if match is not None:
+        return match.groups()
+    # names that are not backtick-quoted are split on '.' 
     return tuple(s.strip('`') for s in full_table_name.split('.'))
 
 
@@ -68,6 +89,10 @@ def reform_full_table_name(schema_name:str, table_name:str):
     return '.'.join(['`'+schema_name+'`', '`'+table_name+'`'])
 
 
+_remove_underscore_and_hash = str.maketrans('', '', '_#')
+
+
+@functools.lru_cache(maxsize=4096)
 def format_table_name(table_name, snake_case=False, part=False):
     """
     Splits full_table_name from DataJoint tables and returns a tuple of (database, table_name).
@@ -78,9 +103,9 @@ def format_table_name(table_name, snake_case=False, part=False):
     """
     if not snake_case:
         if not part:
-            return table_name.title().replace('_','').replace('#','')
+            return table_name.title().translate(_remove_underscore_and_hash)
         else:
-            return table_name.title().replace('__','.').replace('_','').replace('#','')
+            return table_name.title().replace('__','.').translate(_remove_underscore_and_hash)
     else:
         if not part:
             return table_name.lower().strip('_').replace('#','')
@@ -99,17 +124,51 @@ def format_rows_to_df(rows):
     elif (inspect.isclass(rows) and issubclass(rows, QueryExpression)) or isinstance(rows, QueryExpression):
         rows = pd.DataFrame(rows.fetch())
     elif isinstance(rows, list) or isinstance(rows, tuple):
-        rows = pd.DataFrame(rows)
+        columns = _shared_columns(rows)
+        rows = pd.DataFrame(rows) if columns is None else pd.DataFrame.from_records(rows, columns=columns)
     elif isinstance(rows, dict):
-        rows = pd.DataFrame([rows])
+        rows = pd.DataFrame.from_records([rows], columns=list(rows))
     elif isinstance(rows, np.ndarray) and (rows.dtype.fields is not None):
-        rows = pd.DataFrame(rows)
+        rows = pd.DataFrame.from_records(rows, columns=rows.dtype.names)
     else:
         raise ValidationError('Format of rows not recognized. Try a list of dictionaries, a DataJoint expression, a DataJoint fetch object, or a pandas dataframe.')
 
     return rows
 
 
+def format_rows_to_records(rows):
+    """
+    Formats rows as a numpy structured array or a list of dicts without constructing a pandas dataframe. 
+    Use instead of format_rows_to_df when rows are only iterated or their attribute names are needed.
+    :param rows: pandas dataframe, datajoint query expression, dict or tuple
+    :returns: numpy structured array or list of dicts
+    """
+    if isinstance(rows, pd.DataFrame):
+        return rows.to_records(index=False)
+    elif (inspect.isclass(rows) and issubclass(rows, QueryExpression)) or isinstance(rows, QueryExpression):
+        return rows.fetch()
+    elif isinstance(rows, list) or isinstance(rows, tuple):
+        return list(rows)
+    elif isinstance(rows, dict):
+        return [rows]
+    elif isinstance(rows, np.ndarray) and (rows.dtype.fields is not None):
+        return rows
+    else:
+        raise ValidationError('Format of rows not recognized. Try a list of dictionaries, a DataJoint expression, a DataJoint fetch object, or a pandas dataframe.')
+
+
+def _shared_columns(rows):
+    """
+    Returns the keys of rows as a list if rows is a non-empty sequence of dicts that all have the same keys, otherwise None.
+    """
+    if not rows or not isinstance(rows[0], dict):
+        return None
+    keys = rows[0].keys()
+    if all(isinstance(row, dict) and row.keys() == keys for row in rows):
+        return list(keys)
+    return None
+
+
 def load_dependencies(connection, force=False):
     """
     Loads dependencies in a DataJoint connection object.
@@ -160,25 +219,17 @@ def make_store_dict(path):
 
 def _get_calling_context() -> locals:
     # get the calling namespace
-    try:
-        frame = inspect.currentframe().f_back
-        context = frame.f_locals
-    finally:
-        del frame
-    return context
+    return sys._getframe(1).f_locals
 
 
 def add_objects(objects, context=None):
     """
     Imports the adapters for a schema_name into the global namespace.
+    Pass context explicitly (e.g. context=globals()) to avoid looking up the calling frame.
     """   
     if context is None:
         # if context is missing, use the calling namespace
-        try:
-            frame = inspect.currentframe().f_back
-            context = frame.f_locals
-        finally:
-            del frame
+        context = sys._getframe(1).f_locals
     
     for name, obj in objects.items():
         context[name] = obj
@@ -194,8 +245,11 @@ def check_if_latest_version(source='github', return_latest=False):
     """
     try:
         if source == 'github':
-            _latest_version_text = re.search('__version__.*', requests.get(f"https://raw.githubusercontent.com/cajal/datajoint-plus/main/datajoint_plus/version.py").text).group()
-            latest_version = _latest_version_text.split('=')[1].strip(' "'" '") if len(_latest_version_text.split('='))>1 else _latest_version_text.strip(' "'" '")
+            fetched_at, latest_version = _latest_version_cache.get(source, (None, None))
+            if fetched_at is None or time.monotonic() - fetched_at > _latest_version_ttl:
+                _latest_version_text = _version_re.search(requests.get(f"https://raw.githubusercontent.com/cajal/datajoint-plus/main/datajoint_plus/version.py").text).group()
+                latest_version = _latest_version_text.split('=')[1].strip(' "'" '") if len(_latest_version_text.split('='))>1 else _latest_version_text.strip(' "'" '")
+                _latest_version_cache[source] = (time.monotonic(), latest_version)
             if __version__ != latest_version:
                 logger.warning(f'Imported datajoint_plus version, {__version__} does not match the latest version on Github, {latest_version}.')
         else:
@@ -220,7 +274,7 @@ def goto(table_id=None, full_table_name=None, directory='__main__', warn=True):
     returns: class if a table_id match is found, otherwise None
     """
     # handle table_id and full_table_name input
-    assert ~((table_id is None) and (full_table_name is None)), 'Provide table_id or full_table_name'
+    assert not ((table_id is None) and (full_table_name is None)), 'Provide table_id or full_table_name'
 
     if full_table_name is not None:
         table_id_eval = generate_table_id(full_table_name)
@@ -229,30 +283,50 @@ def goto(table_id=None, full_table_name=None, directory='__main__', warn=True):
         table_id = table_id_eval
 
     match = []
+    visited = set()
+    # a full table_id identifies one table, so the search stops at the first match
+    stop_at_first = len(table_id) == 32
     def check_directory(d):
-        for name, obj in inspect.getmembers(d):
+        """
+        Searches classes defined in d and, recursively, their nested classes. Returns True when the search can stop.
+        """
+        # vars instead of inspect.getmembers: avoids evaluating properties and descriptors of every member
+        for name, obj in list(vars(d).items()):
             if name in ['key_source', '_master', 'master', 'UserTable']:
                 continue
-            if inspect.isclass(obj) and issubclass(obj, UserTable):
+            if inspect.isclass(obj) and issubclass(obj, UserTable) and id(obj) not in visited:
+                visited.add(id(obj))
                 try:
                     if table_id in obj.table_id:
                         match.append(obj)
-                        return
+                        if stop_at_first:
+                            return True
+                        continue
                         
-                    check_directory(obj)
-                except:
+                    if check_directory(obj):
+                        return True
+                except Exception:
                     if warn:
                         logger.warning(f'Could not check table_id for {name}')
                     continue
+        return False
                 
     
     if directory == '__main__':
         directory = sys.modules[directory]
+
+    # a full table_id found before is reused if its class is still reachable from directory
+    cached = _goto_cache.get((id(directory), table_id))
+    if cached is not None and cached.table_id == table_id and _getattr_path(directory, cached.__qualname__) is cached:
+        return cached
     
     check_directory(directory)
     
-    n_unique_matches = len(np.unique([m.table_id for m in match]))
+    n_unique_matches = len({m.table_id for m in match})
     if n_unique_matches == 1:
+        if len(_goto_cache) >= _goto_cache_maxsize:
+            _goto_cache.clear()
+        _goto_cache[(id(directory), match[0].table_id)] = match[0]
         return match[0]
     elif n_unique_matches > 1:
         if warn:
@@ -262,6 +336,17 @@ def goto(table_id=None, full_table_name=None, directory='__main__', warn=True):
             logger.warning(f'table_id did not match to any tables. Are you searching the correct directory?')
 
 
+def _getattr_path(obj, path):
+    """
+    Follows a dotted attribute path (e.g. a class __qualname__) from obj. Returns None if any attribute is missing.
+    """
+    for name in path.split('.'):
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
+
+
 def user_choice_with_default_response(default_response=None):
     """Creates a replacement for the DataJoint `user_choice` function that will
     return a default response if one was provided."""
@@ -312,16 +397,17 @@ class safedict(dict):
         super().__init__(*args, **kwargs)
         
     def _key_in_dict(self, *args, **kwargs):
-        in_dict = False
-        for keys in [args, kwargs]:
-            for key in keys:
-                if isinstance(key, dict):
-                    key = list(key.keys())[0]
-                if key in self:
-                    in_dict = True
-                    if self.warn:
-                        self.logger.warning(f'{key} already in safedict.')
-        return in_dict
+        keys = set(kwargs)
+        for arg in args:
+            if isinstance(arg, dict):
+                keys.update(arg)
+            else:
+                keys.add(arg)
+        in_dict = keys & self.keys()
+        if self.warn:
+            for key in in_dict:
+                self.logger.warning(f'{key} already in safedict.')
+        return bool(in_dict)
                     
     def update(self, *args, **kwargs):
         if self._key_in_dict(*args, **kwargs) and not self.overwrite:
@@ -3,12 +3,11 @@ Tools to validate user input.
 """
 
 import re
-from itertools import combinations
-
-import numpy as np
 
 from .errors import OverwriteError
 
+_varchar_len_re = re.compile(r'varchar\((\d+)\)')
+
 
 def pairwise_disjoint_set_validation(sets:list, set_names:list=None, error=Exception):
     """
@@ -22,13 +21,16 @@ def pairwise_disjoint_set_validation(sets:list, set_names:list=None, error=Excep
     if set_names is not None:
         assert len(sets) == len(set_names), 'Length of sets must match length of set_names'
 
-    set_combinations = list(combinations(np.arange(len(sets)), 2))
-    for c in set_combinations:
-        if not set.isdisjoint(sets[c[0]], sets[c[1]]):
-            if set_names is not None:
-                raise error(f'attributes in "{set_names[c[0]]}" and "{set_names[c[1]]}" must be disjoint.')
-            else:
-                raise error(f'attributes in at least two provided sets are not disjoint.')
+    # single pass: map each element to the first set containing it
+    first_seen = {}
+    for j, s in enumerate(sets):
+        for x in s:
+            i = first_seen.setdefault(x, j)
+            if i != j:
+                if set_names is not None:
+                    raise error(f'attributes in "{set_names[i]}" and "{set_names[j]}" must be disjoint.')
+                else:
+                    raise error(f'attributes in at least two provided sets are not disjoint.')
 
 
 def _validate_hash_name_type_and_parse_hash_len(hash_name, attributes):
@@ -47,13 +49,12 @@ def _validate_hash_name_type_and_parse_hash_len(hash_name, attributes):
     except KeyError:
         raise KeyError(f'hash_name "{hash_name}" not found in attributes.') from None
 
-    _, m, e = hash_type.rpartition('varchar')
-    assert m == 'varchar', 'hash_name attribute must be of varchar type'
+    assert 'varchar' in hash_type, 'hash_name attribute must be of varchar type'
 
-    hash_len_match = re.findall('[0-9]+', e)
-    assert hash_len_match and hash_len_match[0].isdigit(), 'hash_name attribute must contain a numeric value specifying hash character length.'
+    hash_len_match = _varchar_len_re.fullmatch(hash_type)
+    assert hash_len_match is not None, 'hash_name attribute must contain a numeric value specifying hash character length.'
     
-    hash_len = int(hash_len_match[0])
+    hash_len = int(hash_len_match.group(1))
     assert hash_len > 0 and hash_len <= 32, 'hash character length must be within range: [1, 32].'
 
     return hash_len
@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('datajoint')
+
+from datajoint_plus.table import _convert_numeric, _is_numeric_fast_path_dtype, _numeric_columns_to_rows
+
+
+def per_cell_rows(rows, names):
+    # rows as Table.insert builds them from a structured array without the fast path
+    rows_to_insert = []
+    for row in rows:
+        placeholders, values = zip(*[_convert_numeric(row[name]) for name in names])
+        rows_to_insert.append({'names': names, 'placeholders': list(placeholders), 'values': list(values)})
+    return rows_to_insert
+
+
+def test_float32_takes_per_cell_path():
+    rows = np.array([(0.1,), (1 / 3,)], dtype=[('x', 'f4')])
+    assert not _is_numeric_fast_path_dtype(rows.dtype['x'])
+    # widening float32 to Python floats would change the inserted text
+    fast = _numeric_columns_to_rows(rows, ['x'])
+    assert [list(r['values']) for r in fast] != [r['values'] for r in per_cell_rows(rows, ['x'])]
+
+
+def test_fast_path_matches_per_cell():
+    rows = np.array(
+        [(0.1, 1, True, 7), (np.nan, -2, False, 8)],
+        dtype=[('f', 'f8'), ('i', 'i8'), ('b', '?'), ('u', 'u4')]
+    )
+    names = list(rows.dtype.names)
+    assert all(_is_numeric_fast_path_dtype(rows.dtype[n]) for n in names)
+
+    fast = _numeric_columns_to_rows(rows, names)
+    for converted, expected in zip(fast, per_cell_rows(rows, names)):
+        assert list(converted['values']) == expected['values']
+        assert converted['placeholders'] == expected['placeholders']